@@ -7,6 +7,109 @@ import plotly.graph_objs as go
 file_path = 'D:/DA-main/vhi/df_all.csv'  # Вказуємо шлях до файлу з даними
 df = pd.read_csv(file_path)
 
+# Індекси, для яких будуються зведені таблиці
+series_columns = ['VCI', 'TCI', 'VHI']
+
+# Кількість періодів на рік для кожної часової роздільності (від найгрубшої до найдрібнішої)
+resolutions = {
+    'yearly': 1,
+    'seasonal': 4,
+    'monthly': 12,
+    'weekly': 52,
+}
+resolution_labels = {
+    'yearly': 'річна',
+    'seasonal': 'квартальна',
+    'monthly': 'місячна',
+    'weekly': 'тижнева',
+}
+
+# Мінімальна кількість точок на графіку, щоб лінія заповнювала ширину полотна:
+# приблизна ширина графіка в пікселях / пікселів на одну точку
+plot_width_px = 800
+px_per_point = 20
+target_points = plot_width_px // px_per_point
+
+# Мінімальна частка вибраних тижнів, яку мають покрити цілі періоди роздільності
+min_week_coverage = 0.9
+
+
+def build_rollup(data, resolution):
+    """
+    Будує зведену таблицю для заданої часової роздільності.
+    Для кожної області та періоду рахує mean/min/max/q25/q75 VCI, TCI, VHI,
+    а також перший і останній тиждень періоду (для фільтра тижнів).
+    """
+    data = data.copy()
+    if resolution == 'weekly':
+        data['period'] = data['Week']
+    else:
+        # Місяць з номера тижня (52 тижні -> 12 місяців)
+        month = ((data['Week'] - 1) * 12 // 52 + 1).clip(1, 12)
+        if resolution == 'monthly':
+            data['period'] = month
+        elif resolution == 'seasonal':
+            # Послідовні тримісячні періоди в межах року: 0 - січень-березень, ..., 3 - жовтень-грудень,
+            # щоб кожен період займав неперервний діапазон тижнів
+            data['period'] = (month - 1) // 3
+        else:
+            data['period'] = 0
+
+    grouped = data.groupby(['oblast', 'Year', 'period'])
+    rollup = grouped['Week'].agg(['min', 'max']).rename(columns={'min': 'Week', 'max': 'Week_end'})
+    for column in series_columns:
+        stats = grouped[column].agg(['mean', 'min', 'max'])
+        stats['q25'] = grouped[column].quantile(0.25)
+        stats['q75'] = grouped[column].quantile(0.75)
+        stats.columns = [column if stat == 'mean' else f"{column}_{stat}" for stat in stats.columns]
+        rollup = rollup.join(stats)
+    rollup = rollup.reset_index()
+
+    # Позиція точки на осі X: рік + частка року
+    periods_per_year = resolutions[resolution]
+    if resolution in ('weekly', 'seasonal'):
+        rollup['x'] = rollup['Year'] + rollup['period'] / periods_per_year
+    elif resolution == 'monthly':
+        rollup['x'] = rollup['Year'] + (rollup['period'] - 1) / periods_per_year
+    else:
+        rollup['x'] = rollup['Year']
+    return rollup.sort_values(['oblast', 'x'], ignore_index=True)
+
+
+def build_period_spans(rollup):
+    # Перший та останній тиждень кожного періоду роздільності
+    return rollup.groupby('period').agg(Week=('Week', 'min'), Week_end=('Week_end', 'max'))
+
+
+def choose_resolution(year_range, week_range):
+    """
+    Повертає найгрубшу роздільність, за якої періоди, що повністю входять
+    у вибраний діапазон тижнів, покривають щонайменше min_week_coverage
+    вибраних тижнів і дають не менше target_points точок. Якщо такої немає - тижнева.
+    """
+    years = year_range[1] - year_range[0] + 1
+    selected_weeks = week_range[1] - week_range[0] + 1
+    for resolution in resolutions:
+        spans = period_spans[resolution]
+        inside = spans[(spans['Week'] >= week_range[0]) & (spans['Week_end'] <= week_range[1])]
+        covered_weeks = (inside['Week_end'] - inside['Week'] + 1).sum()
+        if covered_weeks >= min_week_coverage * selected_weeks and years * len(inside) >= target_points:
+            return resolution
+    return 'weekly'
+
+
+def filter_rollup(rollup, week_range, year_range):
+    # Беремо лише періоди, що повністю входять у вибраний діапазон тижнів
+    return rollup[
+        (rollup['Week'] >= week_range[0]) & (rollup['Week_end'] <= week_range[1]) &
+        (rollup['Year'] >= year_range[0]) & (rollup['Year'] <= year_range[1])
+    ]
+
+
+# Зведені таблиці будуються один раз під час завантаження даних
+rollups = {resolution: build_rollup(df, resolution) for resolution in resolutions}
+period_spans = {resolution: build_period_spans(rollup) for resolution, rollup in rollups.items()}
+
 # Створення додатку Dash
 app = Dash(__name__)
 app.title = "Аналіз VCI, TCI, VHI"
@@ -147,20 +250,52 @@ def update_content(selected_tab, selected_series, selected_region, week_range, y
             ))
         ])
     elif selected_tab == 'time-series-tab':
+        # Для графіка беремо зведену таблицю найгрубшої достатньої роздільності
+        resolution = choose_resolution(year_range, week_range)
+        rollup_df = filter_rollup(rollups[resolution], week_range, year_range)
+        series_df = rollup_df[rollup_df['oblast'] == selected_region]
+        if 'asc' in sort_order:
+            series_df = series_df.sort_values(by=selected_series, ascending=True)
+        elif 'desc' in sort_order:
+            series_df = series_df.sort_values(by=selected_series, ascending=False)
+
+        data = [
+            go.Scatter(
+                x=series_df['x'],  # Рік + період у дробовій частині
+                y=series_df[selected_series],
+                mode='lines',
+                name=f"{selected_series} для області {selected_region}"
+            )
+        ]
+        if resolution != 'weekly' and not sort_order:
+            # Смуги min/max та q25/q75 всередині кожного періоду
+            data = [
+                go.Scatter(x=series_df['x'], y=series_df[f"{selected_series}_max"],
+                           mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'),
+                go.Scatter(x=series_df['x'], y=series_df[f"{selected_series}_min"],
+                           mode='lines', line=dict(width=0), fill='tonexty',
+                           fillcolor='rgba(100, 149, 237, 0.2)', name="min / max"),
+                go.Scatter(x=series_df['x'], y=series_df[f"{selected_series}_q75"],
+                           mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'),
+                go.Scatter(x=series_df['x'], y=series_df[f"{selected_series}_q25"],
+                           mode='lines', line=dict(width=0), fill='tonexty',
+                           fillcolor='rgba(100, 149, 237, 0.4)', name="q25 / q75"),
+            ] + data
+
+        # Цілі періоди можуть не покривати краї вибраного діапазону тижнів - показуємо фактичний
+        title = f"Часовий ряд {selected_series} ({resolution_labels[resolution]} роздільність)"
+        if len(rollup_df) > 0:
+            first_week, last_week = int(rollup_df['Week'].min()), int(rollup_df['Week_end'].max())
+            if (first_week, last_week) != (week_range[0], week_range[1]):
+                title += f", тижні {first_week}–{last_week}"
+
         return html.Div([
             html.H4("Часовий ряд"),
             dcc.Graph(
                 figure=go.Figure(
-                    data=[
-                        go.Scatter(
-                            x=filtered_df['Year'] + (filtered_df['Week'] / 52),  # Рік + тиждень у дробовій частині
-                            y=filtered_df[selected_series],
-                            mode='lines',
-                            name=f"{selected_series} для області {selected_region}"
-                        )
-                    ],
+                    data=data,
                     layout=go.Layout(
-                        title=f"Часовий ряд {selected_series}",
+                        title=title,
                         xaxis=dict(title='Рік'),
                         yaxis=dict(title=selected_series)
                     )
@@ -168,6 +303,7 @@ def update_content(selected_tab, selected_series, selected_region, week_range, y
             )
         ])
     elif selected_tab == 'comparison-plot-tab':
+        # Box plot будується за тижневими спостереженнями: середні за періоди звужують розподіл
         comparison_df = df[
             (df['Week'] >= week_range[0]) & (df['Week'] <= week_range[1]) &
             (df['Year'] >= year_range[0]) & (df['Year'] <= year_range[1])
@@ -0,0 +1,109 @@
+import functools
+
+import numpy as np
+from scipy import fft as sp_fft
+
+# Типи частотних характеристик, які підтримує фільтр
+FILTER_KINDS = ("ideal", "gaussian", "butterworth")
+
+
+def _as_batch(signals):
+    """
+    Приводить вхід до 2-D масиву (кількість сигналів, кількість точок).
+    Повертає масив та ознаку того, що вхід був одновимірним.
+    """
+    signals = np.asarray(signals, dtype=float)
+    if signals.ndim == 1:
+        return signals[np.newaxis, :], True
+    if signals.ndim != 2:
+        raise ValueError("Очікується 1-D сигнал або 2-D масив сигналів (batch, samples)")
+    return signals, False
+
+
+# Кількість періодів частоти зрізу, на які доповнюються краї сигналу:
+# приблизна тривалість імпульсної характеристики фільтра
+pad_cutoff_periods = 2
+
+
+def transform_length(n_samples, fs, cutoff, pad=None):
+    """
+    Повертає кількість точок відбиття з кожного боку та довжину перетворення.
+    За замовчуванням доповнення дорівнює pad_cutoff_periods періодам частоти зрізу,
+    тобто залежить від фільтра, а не від довжини сигналу.
+    Довжина доповнюється до "швидкої" для FFT (добуток малих простих чисел).
+    """
+    if pad is None:
+        pad = int(np.ceil(pad_cutoff_periods * fs / cutoff))
+    pad = int(min(max(pad, 0), n_samples - 1))
+    return pad, sp_fft.next_fast_len(n_samples + 2 * pad, real=True)
+
+
+@functools.lru_cache(maxsize=64)
+def frequency_mask(kind, n_fft, fs, cutoff, order=4):
+    """
+    Частотна маска для rfft довжини n_fft.
+    ideal - прямокутна, gaussian - exp(-ln2 / 2 * (f / cutoff)^2),
+    butterworth - амплітудна характеристика 1 / sqrt(1 + (f / cutoff)^(2 * order)).
+    Для gaussian та butterworth cutoff - точка -3 дБ (підсилення 1 / sqrt(2)).
+    Маски кешуються і повертаються лише для читання.
+    """
+    if kind not in FILTER_KINDS:
+        raise ValueError(f"Невідомий тип фільтра: {kind}. Доступні: {', '.join(FILTER_KINDS)}")
+    if cutoff <= 0:
+        raise ValueError("Частота зрізу має бути додатною")
+
+    freqs = sp_fft.rfftfreq(n_fft, d=1.0 / fs)
+    if kind == "ideal":
+        mask = (freqs <= cutoff).astype(float)
+    elif kind == "gaussian":
+        mask = np.exp(-0.5 * np.log(2) * (freqs / cutoff) ** 2)
+    else:
+        mask = 1.0 / np.sqrt(1.0 + (freqs / cutoff) ** (2 * order))
+    mask.setflags(write=False)
+    return mask
+
+
+def fft_filter(signals, fs, cutoff, kind="butterworth", order=4, pad=None, workers=-1):
+    """
+    Низькочастотна фільтрація в частотній області.
+    Приймає один сигнал або 2-D масив сигналів (batch, samples) і фільтрує
+    всі рядки одним викликом rfft/irfft (workers потоків, -1 - усі ядра).
+    Краї доповнюються дзеркальним відбиттям довжиною pad (за замовчуванням
+    з transform_length), щоб зменшити артефакти циклічної згортки; pad=0 вимикає доповнення.
+    """
+    if cutoff <= 0:
+        raise ValueError("Частота зрізу має бути додатною")
+    batch, squeeze = _as_batch(signals)
+    n_samples = batch.shape[1]
+    if n_samples < 2:
+        return batch[0].copy() if squeeze else batch.copy()
+
+    pad, n_fft = transform_length(n_samples, fs, cutoff, pad)
+    if pad:
+        batch = np.pad(batch, ((0, 0), (pad, pad)), mode="reflect")
+
+    spectrum = sp_fft.rfft(batch, n=n_fft, axis=-1, workers=workers)
+    spectrum *= frequency_mask(kind, n_fft, float(fs), float(cutoff), int(order))
+    filtered = sp_fft.irfft(spectrum, n=n_fft, axis=-1, overwrite_x=True, workers=workers)[:, pad:pad + n_samples]
+    return filtered[0] if squeeze else filtered
+
+
+def power_spectrum(signals, fs):
+    """
+    Одностороння спектральна густина потужності (періодограма з вікном Ганна).
+    Повертає масив частот та PSD тієї ж розмірності, що й вхід.
+    """
+    batch, squeeze = _as_batch(signals)
+    n_samples = batch.shape[1]
+    if n_samples < 3:
+        # Вікно Ганна з 1-2 точок складається з нулів
+        raise ValueError("Для спектра потрібно щонайменше 3 точки")
+    window = np.hanning(n_samples)
+    n_fft = sp_fft.next_fast_len(n_samples, real=True)
+
+    spectrum = sp_fft.rfft((batch - batch.mean(axis=1, keepdims=True)) * window, n=n_fft, axis=-1)
+    psd = np.abs(spectrum) ** 2 / (fs * np.sum(window ** 2))
+    # Подвоюємо всі частоти, крім нульової та частоти Найквіста
+    psd[:, 1:(n_fft + 1) // 2] *= 2
+    freqs = sp_fft.rfftfreq(n_fft, d=1.0 / fs)
+    return freqs, (psd[0] if squeeze else psd)
@@ -1,8 +1,10 @@
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider, Button, CheckButtons
+from matplotlib.widgets import Slider, Button, CheckButtons, RadioButtons
 from scipy import signal
 
+from fft_filter import fft_filter, power_spectrum
+
 # Зберігаємо згенерований шум, щоб він не змінювався, якщо не змінюються параметри шуму
 current_noise = None
 last_noise_mean = None
@@ -45,6 +47,24 @@ def harmonic_with_noise(t, amplitude, frequency, phase, noise_mean, noise_covari
     # Комбінуємо сигнал з шумом, якщо show_noise є True
     return clean_signal + (noise if show_noise else 0), clean_signal
 
+# Типи фільтрів: назва в інтерфейсі -> тип частотної маски (None - Баттерворт у часовій області)
+filter_kinds = {
+    'Баттерворт (filtfilt)': None,
+    'FFT ідеальний': 'ideal',
+    'FFT гаусів': 'gaussian',
+    'FFT Баттерворт': 'butterworth',
+}
+
+def apply_filter(noisy_signal, cutoff, filter_name):
+    """
+    Фільтрує сигнал обраним фільтром з частотою зрізу cutoff.
+    """
+    kind = filter_kinds[filter_name]
+    if kind is None:
+        b, a = signal.butter(4, cutoff, fs=fs) # 4й порядок, частота зрізу, частота дискретизації
+        return signal.filtfilt(b, a, noisy_signal)
+    return fft_filter(noisy_signal, fs, cutoff, kind=kind, order=4)
+
 def update(val):
     """
     Оновлює графік при зміні параметрів.
@@ -62,29 +82,22 @@ def update(val):
                                                                noise_mean, noise_cov, 
                                                                show_noise.get_status()[0])
     
-    # Застосовуємо фільтр Баттерворта
-    # Важливо: фільтрувати потрібно завжди сигнал З ШУМОМ, навіть якщо шум не відображається.
-    # Це відповідає реальному сценарію, де ми фільтруємо отриманий (шумний) сигнал.
-    b, a = signal.butter(4, cutoff_slider.val, fs=100) # 4й порядок, частота зрізу, частота дискретизації
-    filtered_signal = signal.filtfilt(b, a, noisy_signal if show_noise.get_status()[0] else clean_signal_for_filter + current_noise) 
-    # Примітка: якщо шум приховано, ми все одно застосовуємо фільтр до чистого сигналу + збережений шум,
-    # щоб показати результат фільтрації реального сигналу. Якщо show_noise вимкнено, 
-    # noisy_signal в harmonic_with_noise буде просто clean_signal. 
-    # Щоб фільтрувати завжди однаковий базовий шум, використовуємо збережений current_noise.
-    # Уточнення: згідно з завданням "Якщо прапорець прибрано – відображати «чисту гармоніку», якщо ні – зашумлену."
-    # Це стосується відображення *вихідного* сигналу (жовтого).
-    # Фільтр має працювати з сигналом *до* приховування шуму.
-    
-    # Отже, генеруємо сигнал з шумом завжди, але відображаємо його опціонально.
+    # Фільтр має працювати з сигналом *до* приховування шуму,
+    # тому генеруємо сигнал з шумом завжди, але відображаємо його опціонально.
     full_noisy_signal, _ = harmonic_with_noise(t, amp, freq, phase, noise_mean, noise_cov, show_noise=True) # Завжди з шумом для фільтрації
-    b, a = signal.butter(4, cutoff_slider.val, fs=100)
-    filtered_signal = signal.filtfilt(b, a, full_noisy_signal)
+    filtered_signal = apply_filter(full_noisy_signal, cutoff_slider.val, filter_radio.value_selected)
 
     # Оновлюємо дані на графіках
     line_noisy.set_ydata(noisy_signal) # Відображаємо зашумлений або чистий в залежності від чекбокса
     line_clean.set_ydata(filtered_signal) # Відображаємо відфільтрований сигнал
     ax.set_ylim(min(min(noisy_signal), min(filtered_signal)) - 0.2, 
                 max(max(noisy_signal), max(filtered_signal)) + 0.2) # Динамічно змінюємо межі осі Y
+
+    # Оновлюємо спектр (зашумлений сигнал та результат фільтрації)
+    spec_noisy.set_ydata(power_spectrum(full_noisy_signal, fs)[1])
+    spec_filtered.set_ydata(power_spectrum(filtered_signal, fs)[1])
+    ax_spec.relim()
+    ax_spec.autoscale_view(scalex=False)
     fig.canvas.draw_idle() # Оновлюємо полотно
 
 def reset(event):
@@ -101,9 +114,11 @@ def reset(event):
     
     # Скидаємо чекбокс (активуємо перший елемент, що відповідає True)
     show_noise.set_active(0) # Встановлюємо Show Noise як активний (True)
+    filter_radio.set_active(list(filter_kinds).index(initial_filter)) # Повертаємо початковий фільтр
 
 # Створюємо масив часу
 t = np.linspace(0, 10, 1000) # 10 секунд, 1000 точок
+fs = 1 / (t[1] - t[0]) # Частота дискретизації
 
 # Початкові параметри
 initial_amp = 1.0
@@ -112,10 +127,11 @@ initial_phase = 0
 initial_noise_mean = 0.0
 initial_noise_cov = 0.1
 initial_cutoff = 2.0 # Зменшимо початкову частоту зрізу для кращої демонстрації фільтрації
+initial_filter = next(iter(filter_kinds)) # Баттерворт у часовій області
 
-# Створюємо вікно та область для графіка
-fig, ax = plt.subplots(figsize=(10, 8))
-plt.subplots_adjust(left=0.1, bottom=0.4) # Збільшуємо нижній відступ для повзунків
+# Створюємо вікно та області для графіка сигналу і спектра
+fig, (ax, ax_spec) = plt.subplots(2, 1, figsize=(10, 10), gridspec_kw={'height_ratios': [2, 1]})
+plt.subplots_adjust(left=0.1, bottom=0.4, hspace=0.35) # Збільшуємо нижній відступ для повзунків
 
 # Генеруємо початковий сигнал
 # При першому виклику шум буде згенеровано
@@ -123,14 +139,18 @@ noisy_signal, clean_signal_for_filter = harmonic_with_noise(t, initial_amp, init
                                                             initial_noise_mean, initial_noise_cov, show_noise=True)
 
 # Застосовуємо початкову фільтрацію
-b, a = signal.butter(4, initial_cutoff, fs=100)
-filtered_signal = signal.filtfilt(b, a, noisy_signal) # Фільтруємо початковий зашумлений сигнал
+filtered_signal = apply_filter(noisy_signal, initial_cutoff, initial_filter) # Фільтруємо початковий зашумлений сигнал
 
 # Малюємо сигнали
 # Жовта лінія - зашумлений сигнал (або чистий, якщо чекбокс вимкнено)
-line_noisy, = plt.plot(t, noisy_signal, color='orange', alpha=0.8, label='Зашумлений сигнал')
+line_noisy, = ax.plot(t, noisy_signal, color='orange', alpha=0.8, label='Зашумлений сигнал')
 # Синя лінія - відфільтрований сигнал
-line_clean, = plt.plot(t, filtered_signal, color='blue', label='Відфільтрований сигнал')
+line_clean, = ax.plot(t, filtered_signal, color='blue', label='Відфільтрований сигнал')
+
+# Спектральна густина потужності
+freqs, psd_noisy = power_spectrum(noisy_signal, fs)
+spec_noisy, = ax_spec.semilogy(freqs, psd_noisy, color='orange', alpha=0.8, label='Зашумлений сигнал')
+spec_filtered, = ax_spec.semilogy(freqs, power_spectrum(filtered_signal, fs)[1], color='blue', label='Відфільтрований сигнал')
 
 # Налаштування графіка
 ax.set_xlabel("Час [с]")
@@ -140,6 +160,12 @@ ax.grid(True)
 ax.legend()
 ax.set_ylim(min(min(noisy_signal), min(filtered_signal)) - 0.2, 
             max(max(noisy_signal), max(filtered_signal)) + 0.2) # Встановлюємо початкові межі Y
+ax_spec.set_xlabel("Частота [Гц]")
+ax_spec.set_ylabel("PSD")
+ax_spec.set_title("Спектр сигналу")
+ax_spec.set_xlim(0, 10) # Показуємо діапазон частот, що відповідає повзунку частоти зрізу
+ax_spec.grid(True)
+ax_spec.legend()
 
 # Створюємо області для повзунків
 slider_color = 'lightgoldenrodyellow'
@@ -166,6 +192,10 @@ reset_button = Button(reset_ax, 'Скинути', color=slider_color)
 noise_ax = plt.axes([0.8, 0.075, 0.15, 0.04])
 show_noise = CheckButtons(noise_ax, ['Показати шум'], [True]) # Початково активовано
 
+# Створюємо перемикач типу фільтра
+filter_ax = plt.axes([0.82, 0.13, 0.16, 0.2])
+filter_radio = RadioButtons(filter_ax, list(filter_kinds), active=list(filter_kinds).index(initial_filter))
+
 # Прив'язуємо функції оновлення до подій зміни повзунків та чекбокса
 amp_slider.on_changed(update)
 freq_slider.on_changed(update)
@@ -174,6 +204,7 @@ noise_mean_slider.on_changed(update)
 noise_cov_slider.on_changed(update)
 cutoff_slider.on_changed(update)
 show_noise.on_clicked(update) # Оновлюємо при зміні стану чекбокса
+filter_radio.on_clicked(update) # Оновлюємо при зміні типу фільтра
 
 # Прив'язуємо функцію скидання до події натискання кнопки
 reset_button.on_clicked(reset)
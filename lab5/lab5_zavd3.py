@@ -5,6 +5,8 @@ from bokeh.models import ColumnDataSource, Slider, Button, Select, Toggle
 from bokeh.layouts import column, row
 from bokeh.io import curdoc
 
+from fft_filter import fft_filter, power_spectrum
+
 # Зберігаємо згенерований шум, щоб він не змінювався, якщо не змінюються параметри шуму
 current_noise = None
 last_noise_mean = None
@@ -66,8 +68,54 @@ def custom_moving_average_filter(signal, window_size):
     filtered_signal = np.convolve(signal, kernel, mode='same')
     return filtered_signal
 
+class StreamingMovingAverage:
+    """
+    Ковзне середнє для потокових даних.
+    Зберігає останні window_size - 1 відліків між викликами, тому кожна нова
+    порція фільтрується за O(довжина порції) незалежно від тривалості потоку.
+    На відміну від custom_moving_average_filter (mode='same'), фільтр причинний:
+    вихід залежить лише від поточного та попередніх відліків.
+    """
+    def __init__(self, window_size):
+        self.reset(window_size)
+
+    def reset(self, window_size):
+        self.window_size = max(1, int(window_size))
+        self.tail = np.empty(0)
+
+    def process(self, chunk):
+        if self.window_size <= 1:
+            return chunk
+        extended = np.concatenate([self.tail, chunk])
+        # Поки буфер не заповнений, усереднюємо по наявних відліках
+        cumsum = np.cumsum(np.concatenate([[0.0], extended]))
+        end = np.arange(len(self.tail) + 1, len(extended) + 1)
+        start = np.maximum(end - self.window_size, 0)
+        filtered = (cumsum[end] - cumsum[start]) / (end - start)
+        self.tail = extended[-(self.window_size - 1):]
+        return filtered
+
+# Типи фільтрів: назва в інтерфейсі -> тип частотної маски (None - ковзне середнє)
+filter_kinds = {
+    "Ковзне середнє": None,
+    "FFT ідеальний": "ideal",
+    "FFT гаусів": "gaussian",
+    "FFT Баттерворт": "butterworth",
+}
+
+def apply_filter(signal, filter_name, window_size, cutoff):
+    """
+    Фільтрує сигнал обраним фільтром: ковзним середнім з вікном window_size
+    або FFT-фільтром з частотою зрізу cutoff.
+    """
+    kind = filter_kinds[filter_name]
+    if kind is None:
+        return custom_moving_average_filter(signal, window_size)
+    return fft_filter(signal, fs, cutoff, kind=kind, order=4)
+
 # Створюємо масив часу
 t = np.linspace(0, 10, 1000)
+fs = 1 / (t[1] - t[0]) # Частота дискретизації
 
 # Початкові параметри
 initial_amp = 1.0
@@ -76,11 +124,19 @@ initial_phase = 0
 initial_noise_mean = 0.0
 initial_noise_cov = 0.1
 initial_window_size = 10
+initial_filter = "Ковзне середнє"
+initial_cutoff = 2.0
+
+# Параметри live-режиму
+live_period_ms = 50 # Період оновлення
+live_chunk_size = max(1, int(round(fs * live_period_ms / 1000))) # Нових відліків за один тік (реальний час)
+live_rollover = len(t) # Максимальна кількість точок на графіку
+live_spectrum_every = 10 # Спектр перераховується раз на стільки тіків
 
 # Генеруємо початкові дані
 initial_clean_signal, initial_noisy_signal = harmonic_with_noise(t, initial_amp, initial_freq, initial_phase,
                                                                    initial_noise_mean, initial_noise_cov)
-initial_filtered_signal = custom_moving_average_filter(initial_noisy_signal, initial_window_size)
+initial_filtered_signal = apply_filter(initial_noisy_signal, initial_filter, initial_window_size, initial_cutoff)
 
 # Створюємо джерело даних Bokeh
 source = ColumnDataSource(data=dict(t=t,
@@ -88,6 +144,12 @@ source = ColumnDataSource(data=dict(t=t,
                                    noisy_signal=initial_noisy_signal,
                                    filtered_signal=initial_filtered_signal))
 
+# Джерело даних для спектра
+freqs, initial_noisy_psd = power_spectrum(initial_noisy_signal, fs)
+spectrum_source = ColumnDataSource(data=dict(freq=freqs,
+                                             noisy_psd=initial_noisy_psd,
+                                             filtered_psd=power_spectrum(initial_filtered_signal, fs)[1]))
+
 # Створюємо перший графік (Вихідний сигнал)
 plot1 = figure(height=300, width=800, title="Вихідний сигнал (Чистий / Зашумлений)",
                tools="pan,wheel_zoom,box_zoom,reset,save")
@@ -99,11 +161,20 @@ plot2 = figure(height=300, width=800, title="Відфільтрований си
                tools="pan,wheel_zoom,box_zoom,reset,save", x_range=plot1.x_range) # Ділимо вісь X
 line_filtered = plot2.line('t', 'filtered_signal', source=source, line_width=2, color='green', legend_label="Відфільтрований сигнал")
 
+# Створюємо третій графік (Спектральна густина потужності)
+plot3 = figure(height=250, width=800, title="Спектр сигналу", y_axis_type="log",
+               x_range=(0, 10), x_axis_label="Частота [Гц]", y_axis_label="PSD",
+               tools="pan,wheel_zoom,box_zoom,reset,save")
+plot3.line('freq', 'noisy_psd', source=spectrum_source, line_width=2, color='orange', legend_label="Зашумлений сигнал")
+plot3.line('freq', 'filtered_psd', source=spectrum_source, line_width=2, color='green', legend_label="Відфільтрований сигнал")
+
 # Налаштування легенди
 plot1.legend.location = "top_right"
 plot1.legend.click_policy="hide" # Дозволяє приховувати/показувати лінії по кліку на легенді
 plot2.legend.location = "top_right"
 plot2.legend.click_policy="hide"
+plot3.legend.location = "top_right"
+plot3.legend.click_policy="hide"
 
 # Створюємо повзунки
 amp_slider = Slider(start=0.1, end=2.0, value=initial_amp, step=.1, title="Амплітуда")
@@ -112,6 +183,10 @@ phase_slider = Slider(start=-np.pi, end=np.pi, value=initial_phase, step=np.pi/1
 noise_mean_slider = Slider(start=-0.5, end=0.5, value=initial_noise_mean, step=.05, title="Шум (сер.)")
 noise_cov_slider = Slider(start=0.001, end=0.5, value=initial_noise_cov, step=.01, title="Шум (дисп.)")
 window_slider = Slider(start=1, end=50, value=initial_window_size, step=1, title="Розмір вікна фільтра")
+cutoff_slider = Slider(start=0.1, end=10.0, value=initial_cutoff, step=.1, title="Частота зрізу (FFT)")
+
+# Спадне меню для вибору фільтра
+filter_select = Select(title="Фільтр:", value=initial_filter, options=list(filter_kinds))
 
 # Створюємо спадне меню для вибору відображення на першому графіку
 view_select = Select(title="Показати на верхньому графіку:", value="Зашумлений",
@@ -120,6 +195,17 @@ view_select = Select(title="Показати на верхньому графі
 # Створюємо кнопку Reset
 reset_button = Button(label="Скинути параметри")
 
+# Перемикач live-режиму
+live_toggle = Toggle(label="Live режим", button_type="success", active=False)
+
+# Стан live-режиму
+live_filter = StreamingMovingAverage(initial_window_size)
+live_sample_index = 0
+live_tick_count = 0
+live_callback = None
+live_saved_filter = initial_filter # Фільтр, обраний до входу в live-режим
+live_filter_name = "Ковзне середнє" # Фільтр, що працює в live-режимі
+
 # Функція оновлення даних
 def update_data(attrname, old, new):
     """
@@ -131,13 +217,23 @@ def update_data(attrname, old, new):
     noise_mean = noise_mean_slider.value
     noise_cov = noise_cov_slider.value
     window_size = window_slider.value
+    cutoff = cutoff_slider.value
+    filter_name = filter_select.value
     view_option = view_select.value
 
+    # Керуємо видимістю ліній на першому графіку відповідно до вибору у спадному меню
+    line_clean.visible = (view_option == "Чистий")
+    line_noisy.visible = (view_option == "Зашумлений")
+
+    # У live-режимі параметри зчитуються на кожному тіку, повністю дані не замінюємо
+    if live_toggle.active:
+        return
+
     # Генеруємо сигнали (завжди отримуємо чистий та зашумлений для подальшої обробки)
     clean_signal, noisy_signal = harmonic_with_noise(t, amp, freq, phase, noise_mean, noise_cov)
 
-    # Застосовуємо власний фільтр до зашумленого сигналу
-    filtered_signal = custom_moving_average_filter(noisy_signal, window_size)
+    # Застосовуємо обраний фільтр до зашумленого сигналу
+    filtered_signal = apply_filter(noisy_signal, filter_name, window_size, cutoff)
 
     # Оновлюємо джерело даних
     source.data = dict(t=t,
@@ -145,9 +241,74 @@ def update_data(attrname, old, new):
                         noisy_signal=noisy_signal,
                         filtered_signal=filtered_signal)
 
-    # Керуємо видимістю ліній на першому графіку відповідно до вибору у спадному меню
-    line_clean.visible = (view_option == "Чистий")
-    line_noisy.visible = (view_option == "Зашумлений")
+    # Обидва спектри рахуються одним пакетним викликом
+    freqs, psd = power_spectrum(np.vstack([noisy_signal, filtered_signal]), fs)
+    spectrum_source.data = dict(freq=freqs, noisy_psd=psd[0], filtered_psd=psd[1])
+
+
+def stream_tick():
+    """
+    Генерує нову порцію відліків з поточними параметрами, фільтрує її
+    потоковим ковзним середнім і додає на графік через source.stream.
+    """
+    global live_sample_index, live_tick_count
+
+    if int(window_slider.value) != live_filter.window_size:
+        live_filter.reset(window_slider.value)
+
+    t_chunk = (live_sample_index + np.arange(live_chunk_size)) / fs
+    live_sample_index += live_chunk_size
+
+    clean_chunk = amp_slider.value * np.sin(2 * np.pi * freq_slider.value * t_chunk + phase_slider.value)
+    noise_chunk = np.random.normal(noise_mean_slider.value, np.sqrt(max(0, noise_cov_slider.value)), live_chunk_size)
+    noisy_chunk = clean_chunk + noise_chunk
+
+    source.stream(dict(t=t_chunk,
+                       clean_signal=clean_chunk,
+                       noisy_signal=noisy_chunk,
+                       filtered_signal=live_filter.process(noisy_chunk)),
+                  rollover=live_rollover)
+
+    # Спектр рахуємо за поточним вмістом рухомого буфера
+    live_tick_count += 1
+    if live_tick_count % live_spectrum_every == 0 and len(source.data['t']) >= 3:
+        buffer = np.vstack([np.asarray(source.data['noisy_signal'], dtype=float),
+                            np.asarray(source.data['filtered_signal'], dtype=float)])
+        freqs, psd = power_spectrum(buffer, fs)
+        spectrum_source.data = dict(freq=freqs, noisy_psd=psd[0], filtered_psd=psd[1])
+
+
+def toggle_live(active):
+    """
+    Вмикає або вимикає live-режим.
+    """
+    global live_callback, live_sample_index, live_tick_count, live_saved_filter
+
+    # У live-режимі завжди працює потокове ковзне середнє, FFT-фільтри недоступні
+    filter_select.disabled = active
+    cutoff_slider.disabled = active
+
+    doc = curdoc()
+    if active:
+        # Показуємо фактичний фільтр; update_data в live-режимі дані не замінює
+        live_saved_filter = filter_select.value
+        filter_select.value = live_filter_name
+        live_sample_index = 0
+        live_tick_count = 0
+        live_filter.reset(window_slider.value)
+        source.data = dict(t=[], clean_signal=[], noisy_signal=[], filtered_signal=[])
+        live_callback = doc.add_periodic_callback(stream_tick, live_period_ms)
+        live_toggle.label = "Зупинити live режим"
+    else:
+        if live_callback is not None:
+            doc.remove_periodic_callback(live_callback)
+            live_callback = None
+        live_toggle.label = "Live режим"
+        # Повертаємось до статичного графіка з фільтром, обраним до live-режиму
+        if filter_select.value != live_saved_filter:
+            filter_select.value = live_saved_filter # Колбек on_change сам викличе update_data
+        else:
+            update_data(None, None, None)
 
 
 # Функція скидання параметрів
@@ -155,26 +316,38 @@ def reset_params():
     """
     Скидає повзунки та вибори до початкових значень і оновлює графік.
     """
+    global live_saved_filter
+
     amp_slider.value = initial_amp
     freq_slider.value = initial_freq
     phase_slider.value = initial_phase
     noise_mean_slider.value = initial_noise_mean
     noise_cov_slider.value = initial_noise_cov
     window_slider.value = initial_window_size
+    cutoff_slider.value = initial_cutoff
+    if live_toggle.active:
+        # У live-режимі меню показує фактичний фільтр, початковий відновиться після виходу
+        live_saved_filter = initial_filter
+    else:
+        filter_select.value = initial_filter
     view_select.value = "Зашумлений" # Скидаємо вибір відображення
 
     # Оновлення графіка відбудеться автоматично через прив'язані нижче колбеки
 
 # Прив'язуємо функцію оновлення до зміни значень повзунків та спадного меню
-sliders = [amp_slider, freq_slider, phase_slider, noise_mean_slider, noise_cov_slider, window_slider]
+sliders = [amp_slider, freq_slider, phase_slider, noise_mean_slider, noise_cov_slider, window_slider, cutoff_slider]
 for slider in sliders:
     slider.on_change('value', update_data)
 
 view_select.on_change('value', update_data)
+filter_select.on_change('value', update_data)
 
 # Прив'язуємо функцію скидання до кнопки
 reset_button.on_click(reset_params)
 
+# Прив'язуємо перемикач live-режиму
+live_toggle.on_click(toggle_live)
+
 # Встановлюємо початкову видимість ліній відповідно до початкового значення view_select
 line_clean.visible = (view_select.value == "Чистий")
 line_noisy.visible = (view_select.value == "Зашумлений")
@@ -183,10 +356,11 @@ line_noisy.visible = (view_select.value == "Зашумлений")
 # Розміщуємо повзунки та кнопку збоку від графіків
 controls = column(amp_slider, freq_slider, phase_slider,
                    noise_mean_slider, noise_cov_slider,
-                   window_slider, view_select, reset_button)
+                   window_slider, filter_select, cutoff_slider,
+                   view_select, live_toggle, reset_button)
 
 # Розміщуємо графіки один під одним, а панель управління - поруч
-layout = row(column(plot1, plot2), controls)
+layout = row(column(plot1, plot2, plot3), controls)
 
 # Додаємо макет до кореневого елемента документа Bokeh
 curdoc().add_root(layout)
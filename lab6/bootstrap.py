@@ -0,0 +1,124 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Максимальна кількість елементів матриці індексів в одному блоці реплікацій.
+# Блок має власний seed і обробляється одним процесом, тому результат
+# не залежить від кількості процесів
+maks_elementiv_bloku = 2_000_000
+
+# Мінімальний обсяг роботи (реплікації * точки), з якого за замовчуванням
+# вмикається пул процесів: для менших задач запуск процесів дорожчий за обчислення
+min_robota_pulu = 50_000_000
+
+
+def indeksy_bootstrap(generator, kilkist_danykh, kilkist_replikatsii):
+    # Матриця індексів (реплікації, точки): вибірка з поверненням
+    return generator.integers(0, kilkist_danykh, size=(kilkist_replikatsii, kilkist_danykh))
+
+
+def indeksy_perestanovok(generator, kilkist_danykh, kilkist_replikatsii):
+    # Матриця індексів (реплікації, точки): випадкова перестановка в кожному рядку
+    return generator.permuted(np.tile(np.arange(kilkist_danykh), (kilkist_replikatsii, 1)), axis=1)
+
+
+def paketnyi_mnk(dani_x, dani_y):
+    """
+    МНК для всіх реплікацій одночасно.
+    dani_x, dani_y - масиви (реплікації, точки). Повертає масиви k та b.
+    """
+    serednie_x = dani_x.mean(axis=1, keepdims=True)
+    serednie_y = dani_y.mean(axis=1, keepdims=True)
+    vidkhylennia_x = dani_x - serednie_x
+
+    znamennik = np.sum(vidkhylennia_x ** 2, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Якщо всі x у реплікації однакові, k = nan
+        otsinka_k = np.sum(vidkhylennia_x * (dani_y - serednie_y), axis=1) / znamennik
+    otsinka_b = serednie_y[:, 0] - otsinka_k * serednie_x[:, 0]
+    return otsinka_k, otsinka_b
+
+
+def _obrobyty_blok(argumenty):
+    # Обробка одного блоку реплікацій (виконується в окремому процесі)
+    dani_x, dani_y, metod, kilkist_replikatsii, seed = argumenty
+    generator = np.random.default_rng(seed)
+    kilkist_danykh = len(dani_x)
+
+    if metod == 'bootstrap':
+        indeksy = indeksy_bootstrap(generator, kilkist_danykh, kilkist_replikatsii)
+        return paketnyi_mnk(dani_x[indeksy], dani_y[indeksy])
+
+    # Перестановочний тест: перемішуємо y відносно x
+    indeksy = indeksy_perestanovok(generator, kilkist_danykh, kilkist_replikatsii)
+    return paketnyi_mnk(np.broadcast_to(dani_x, indeksy.shape), dani_y[indeksy])
+
+
+def _replikatsii(dani_x, dani_y, metod, kilkist_replikatsii, seed, kilkist_protsesiv):
+    """
+    Розбиває реплікації на блоки з незалежними seed (SeedSequence.spawn)
+    і обчислює їх послідовно або в пулі процесів.
+    """
+    dani_x = np.asarray(dani_x, dtype=float)
+    dani_y = np.asarray(dani_y, dtype=float)
+    if dani_x.shape != dani_y.shape or dani_x.ndim != 1 or len(dani_x) < 2:
+        raise ValueError("dani_x та dani_y мають бути одновимірними масивами однакової довжини (не менше 2 точок)")
+    if int(kilkist_replikatsii) != kilkist_replikatsii or kilkist_replikatsii < 1:
+        raise ValueError("Кількість реплікацій має бути цілим числом не менше 1")
+    kilkist_replikatsii = int(kilkist_replikatsii)
+
+    rozmir_bloku = max(1, maks_elementiv_bloku // len(dani_x))
+    rozmiry = [rozmir_bloku] * (kilkist_replikatsii // rozmir_bloku)
+    if kilkist_replikatsii % rozmir_bloku:
+        rozmiry.append(kilkist_replikatsii % rozmir_bloku)
+    seeds = np.random.SeedSequence(seed).spawn(len(rozmiry))
+    zavdannia = [(dani_x, dani_y, metod, rozmir, s) for rozmir, s in zip(rozmiry, seeds)]
+
+    if kilkist_protsesiv is None:
+        if kilkist_replikatsii * len(dani_x) < min_robota_pulu:
+            kilkist_protsesiv = 1
+        else:
+            kilkist_protsesiv = os.cpu_count() or 1
+    kilkist_protsesiv = min(kilkist_protsesiv, len(zavdannia))
+
+    if kilkist_protsesiv <= 1:
+        rezultaty = [_obrobyty_blok(z) for z in zavdannia]
+    else:
+        with ProcessPoolExecutor(max_workers=kilkist_protsesiv) as pul:
+            rezultaty = list(pul.map(_obrobyty_blok, zavdannia))
+
+    otsinky_k = np.concatenate([r[0] for r in rezultaty])
+    otsinky_b = np.concatenate([r[1] for r in rezultaty])
+    return otsinky_k, otsinky_b
+
+
+def bootstrap_intervaly(dani_x, dani_y, kilkist_replikatsii=10000, riven=0.95, seed=None, kilkist_protsesiv=None):
+    """
+    Перцентильні bootstrap довірчі інтервали для k та b лінійної регресії.
+    Результат відтворюваний для фіксованого seed незалежно від кількості процесів.
+    kilkist_protsesiv=None - пул процесів лише для задач від min_robota_pulu.
+    """
+    otsinky_k, otsinky_b = _replikatsii(dani_x, dani_y, 'bootstrap', kilkist_replikatsii, seed, kilkist_protsesiv)
+    alfa = (1 - riven) / 2
+    return {
+        'k': tuple(np.nanquantile(otsinky_k, [alfa, 1 - alfa])),
+        'b': tuple(np.nanquantile(otsinky_b, [alfa, 1 - alfa])),
+        'k_std': np.nanstd(otsinky_k),
+        'b_std': np.nanstd(otsinky_b),
+        'otsinky_k': otsinky_k,
+        'otsinky_b': otsinky_b,
+    }
+
+
+def perestanovochnyi_test(dani_x, dani_y, kilkist_replikatsii=10000, seed=None, kilkist_protsesiv=None):
+    """
+    Двосторонній перестановочний тест для нахилу (H0: k = 0).
+    Повертає спостережуваний нахил та p-значення.
+    """
+    # Спочатку реплікації: _replikatsii перевіряє вхідні дані
+    otsinky_k, _ = _replikatsii(dani_x, dani_y, 'permutation', kilkist_replikatsii, seed, kilkist_protsesiv)
+    sposterezhenyi_k, _ = paketnyi_mnk(np.asarray(dani_x, dtype=float)[np.newaxis, :],
+                                       np.asarray(dani_y, dtype=float)[np.newaxis, :])
+    p_znachennia = (np.sum(np.abs(otsinky_k) >= abs(sposterezhenyi_k[0])) + 1) / (kilkist_replikatsii + 1)
+    return sposterezhenyi_k[0], p_znachennia